@@ -13,33 +13,157 @@ Sorts the entries in the contents files of each sub folder alphabetically.
 import os
 import re
 import datetime
-import json
 import textwrap
+import threading
+import concurrent.futures
+from operator import itemgetter
+from itertools import chain
+from collections import Counter, defaultdict
+from urllib.parse import urlsplit
 from utils import osg, osg_ui, osg_parse, utils, constants as c
 import requests
+from requests.adapters import HTTPAdapter
 
+# regex for finding urls in entries (can be in <> or in ]() or after a whitespace)
+regex_external_links = re.compile(r"[\s\n]<(http.+?)>|\]\((http.+?)\)|[\s\n](http[^\s\n,]+?)[\s\n\)]")
 
-def check_validity_backlog():
-    import requests
+# regex for finding urls (in parenthesis) in the rejected file
+regex_rejected_urls = re.compile(r"\((http.*?)\)", re.MULTILINE)
+
+# regex for identifying the building blocks in the readme
+regex_readme_autogenerated = re.compile(r"(.*?)(\[comment\]: # \(start.*?end of autogenerated content\))(.*)", re.DOTALL)
+
+# domains (or parts of them) of git repositories that are counted in the repository statistics
+repo_domains = ('repo.or.cz', 'anongit.kde.org', 'bitbucket.org', 'git.code.sf.net', 'git.savannah', 'git.tuxfamily',
+                'github.com', 'gitlab.com', 'gitlab.com/osgames', 'gitlab.gnome.org')
+
+# regex matching any of these domains (longest first, so that gitlab.com/osgames wins over gitlab.com)
+regex_repo_domains = re.compile('|'.join(re.escape(x) for x in sorted(repo_domains, key=len, reverse=True)))
+
+# fields of which the plain values are cached in each entry after reading
+cached_value_fields = ('State', 'Platform', 'Keyword', 'Code repository', 'Code language', 'Code license',
+                       'Code dependency')
+
+# keyword "first-person" but written with a unicode hyphen (U+2010), should not be used
+first_person_keyword = b'first\xe2\x80\x90person'.decode()
+
+# number of parallel workers when checking external links or the backlog (network bound)
+external_links_workers = 64
+backlog_workers = 50
+
+# maximal number of simultaneous requests to the same host when checking external links or the backlog
+requests_per_host = 4
 
+# number of parallel workers when writing the toc files
+toc_workers = 8
+
+
+def check_validity_backlog():
+    """
+    Checks all urls of the backlog in parallel (HEAD request, GET only if HEAD is not supported), prints those with
+    non OK HTTP responses or redirects.
+    """
     # read backlog and split
-    file = os.path.join(c.root_path, 'code', 'backlog.txt')
-    text = utils.read_text(file)
+    text = utils.read_text(c.backlog_file)
     urls = text.split('\n')
     urls = [x.split(' ')[0] for x in urls]
+    host_limits = create_host_limits(urls)
 
-    headers = {'user-agent': 'Mozilla/5.0 (Windows NT 10.0; WOW64)'}
-    for url in urls:
+    def check_url(url):
+        """
+        Checks a single url, returns the output line or None if everything is okay.
+        """
         try:
-            r = requests.get(url, headers=headers, timeout=5)
+            r = request_url(url, host_limits, timeout=5)
         except Exception as e:
-            print('{} gave error: {}'.format(url, e))
-        else:
-            if r.status_code != requests.codes.ok:
-                print('{} returned status code: {}'.format(url, r.status_code))
+            return '{} gave error: {}'.format(url, e)
+        output = []
+        if r.status_code != requests.codes.ok:
+            output.append('{} returned status code: {}'.format(url, r.status_code))
+        if r.is_redirect or r.history:
+            output.append('{} redirected to {}, {}'.format(url, r.url, r.history))
+        return '\n'.join(output) if output else None
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=backlog_workers) as executor:
+        for output in executor.map(check_url, urls):
+            if output:
+                print(output)
+
+
+def create_http_session(pool_size):
+    """
+    Creates a requests session with a connection pool large enough for the given number of parallel workers, so that
+    connections (and TLS handshakes) to the same host are reused. Failed requests are not retried.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update({'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; WOW64)'})
+    return session
+
+
+# a single session for all url checks (connections to the same host are reused across all of them)
+http_session = create_http_session(max(external_links_workers, backlog_workers))
+
+
+def create_host_limits(urls):
+    """
+    Returns a semaphore for each host of the urls, which limits the number of simultaneous requests to this host to
+    requests_per_host (to not hammer a single server).
+    """
+    host_limits = {}
+    for url in urls:
+        host = urlsplit(url).netloc
+        if host not in host_limits:
+            host_limits[host] = threading.BoundedSemaphore(requests_per_host)
+    return host_limits
+
+
+def request_url(url, host_limits, timeout, verify=True):
+    """
+    Requests a url with the shared session (HEAD request, GET only if HEAD is not supported), while holding the
+    semaphore of its host (see create_host_limits). Returns the response, exceptions are passed on.
+    """
+    with host_limits[urlsplit(url).netloc]:
+        r = http_session.head(url, timeout=timeout, allow_redirects=True, verify=verify)
+        if r.status_code == 405:  # head method not supported, try get
+            r = http_session.get(url, timeout=timeout, allow_redirects=True, verify=verify)
+    return r
+
+
+def cache_values(entry):
+    """
+    Stores the plain values of often used fields (and of the build systems) as tuples under the key '_values' in an
+    entry, so that the loops over all entries do not need to extract them again and again.
+
+    Must be called again if these fields of the entry are changed.
+    """
+    values = {field: tuple(x.value for x in entry.get(field, [])) for field in cached_value_fields}
+    values['Build system'] = tuple(x.value for x in entry['Building'].get('Build system', []))
+    entry['_values'] = values
+
+
+def remove_library_developers(entry):
+    """
+    Removes the developers from an entry that has library as keyword (no developers needed for libraries).
+    """
+    if 'library' in entry['Keyword']:
+        devs = entry.get('Developer', [])
+        if devs:
+            print('entry {} is library and has {} developer'.format(entry['File'], len(devs)))
+            del entry['Developer']
+
+
+def relative_frequencies(counter):
+    """
+    Given a Counter, returns a list of (value, relative frequency) sorted by value (case insensitive). The casefolded
+    values are computed once and sorted together with the values (decorate-sort-undecorate).
+    """
+    total = sum(counter.values())
+    decorated = sorted((value.casefold(), value, count / total) for value, count in counter.items())
+    return [(value, frequency) for _, value, frequency in decorated]
 
-            if r.is_redirect or r.history:
-                print('{} redirected to {}, {}'.format(url, r.url, r.history))
 
 def create_toc(title, file, entries):
     """
@@ -68,13 +192,60 @@ def create_toc(title, file, entries):
     utils.write_text(toc_file, text)
 
 
+def extract_html_row(info):
+    """
+    Extracts the row of an entry in the dynamic html table (game & description, download, state, keywords, source).
+    """
+    keywords, languages, licenses, repos = info['Keyword'], info['Code language'], info['Code license'], info.get('Code repository')
+
+    # source (repository, languages, licenses)
+    source = '<a href="{}">Source</a> - '.format(repos[0].value) if repos else ''
+    source += ', '.join(x.value for x in languages) + ' - ' + ', '.join(x.value for x in licenses)
+
+    return ('{} (<a href="{}">home</a>, <a href="{}">entry</a>)'.format(info['Title'], info['Home'][0],
+                                                                    r'https://github.com/Trilarion/opensourcegames/blob/master/entries/' +
+                                                                    info['File']),  # game
+            textwrap.shorten(info.get('Note', ''), width=60, placeholder='..'),  # description
+            '<a href="{}">Link</a>'.format(info['Download'][0]) if info.get('Download') else '',  # download
+            '{} / {}'.format(info['State'][0],  # state (field state is essential)
+                             'inactive since {}'.format(osg.extract_inactive_year(info)) if osg.is_inactive(info) else 'active'),
+            ', '.join(x.value for x in keywords),  # keywords
+            source)
+
+
+def extract_git_repos(entry):
+    """
+    Returns the git repositories (urls without remarks) of an entry.
+    """
+    git_repos = []
+    for repo in entry.get('Code repository', []):
+        repo = repo.value.split(' ')[0].strip()
+        if osg.git_repo(repo):
+            git_repos.append(repo)
+    return git_repos
+
+
+def classify_repos(repos):
+    """
+    Sorts repo values (url followed by optional remarks like @add) by their repo type. Returns a dictionary with the
+    urls for each repo type ('git', 'svn', 'hg') and for None (not recognized).
+    """
+    classified = {'git': [], 'svn': [], 'hg': [], None: []}
+    for repo in repos:
+        repo = repo.partition(' ')[0].strip()
+        classified[osg.repo_type(repo)].append(repo)
+    return classified
+
+
 def sort_text_file(file, name):
     """
     Reads a text file, splits in lines, removes duplicates, sort, writes back.
     """
     text = utils.read_text(file)
     text = text.split('\n')
-    text = sorted(list(set(text)), key=str.casefold)
+    # sorting also by the line itself brings identical lines next to each other, then they are skipped
+    text.sort(key=lambda x: (x.casefold(), x))
+    text = [x for i, x in enumerate(text) if i == 0 or x != text[i - 1]]
     print('{} contains {} items'.format(name, len(text)))
     text = '\n'.join(text)
     utils.write_text(file, text)
@@ -84,9 +255,11 @@ class EntriesMaintainer:
 
     def __init__(self):
         self.entries = None
+        # called for every entry while reading (instead of another pass over all entries afterwards)
+        self.post_load_hooks = [cache_values]
 
     def read_entries(self):
-        self.entries = osg.read_entries()
+        self.entries = osg.read_entries(self.post_load_hooks)
         print('{} entries read'.format(len(self.entries)))
 
     def write_entries(self):
@@ -103,15 +276,20 @@ class EntriesMaintainer:
         Should be run only occasionally.
         """
         # load template and get all lines
-        text = utils.read_text(os.path.join(c.root_path, 'template.md'))
+        text = utils.read_text(c.template_file)
         text = text.split('\n')
         check_strings = [x for x in text if x and not x.startswith('##')]
 
-        # iterate over all entries
-        for _, entry_path, content in osg.entry_iterator():
+        # a single regex matching any of them, so that entries without leftovers (most) are only scanned once
+        regex = re.compile('|'.join(re.escape(x) for x in set(check_strings)))
 
+        # iterate over all entries
+        for _, entry_path, content in osg.entry_iterator(prefetch=True):
+            if not regex.search(content):
+                continue
+            # the regex does not find overlapping or contained leftovers, so check every one of them
             for check_string in check_strings:
-                if content.find(check_string) >= 0:
+                if check_string in content:
                     print('{}: found {}'.format(os.path.basename(entry_path), check_string))
         print('checked for template leftovers')
 
@@ -123,46 +301,43 @@ class EntriesMaintainer:
         if not self.entries:
             print('entries not yet loaded')
             return
-        # get all keywords and print similar keywords
-        keywords = []
+        # get all keywords (reduce those starting with "multiplayer") and print similar keywords
+        keywords = Counter()
         for entry in self.entries:
-            keywords.extend(entry['Keyword'])
-            if b'first\xe2\x80\x90person'.decode() in entry['Keyword']:
+            entry_keywords = entry['_values']['Keyword']
+            keywords.update(x if not x.startswith('multiplayer') else 'multiplayer' for x in entry_keywords)
+            if first_person_keyword in entry_keywords:
                 print(entry['File'])
-        keywords = [x.value for x in keywords]
-
-        # reduce those starting with "multiplayer"
-        keywords = [x if not x.startswith('multiplayer') else 'multiplayer' for x in keywords]
 
-        # check unique keywords
-        unique_keywords = list(set(keywords))
-        unique_keywords_counts = [keywords.count(l) for l in unique_keywords]
+        # check unique keywords (sorted by length, because the similarity of two keywords cannot be larger than
+        # 2 * shorter length / sum of lengths, we can stop comparing as soon as the other keywords are too long)
+        # the similarity depends on the order of the two keywords, the larger one is taken
+        unique_keywords = sorted(keywords.keys(), key=lambda x: len(x.casefold()))
+        unique_keywords_lengths = [len(x.casefold()) for x in unique_keywords]
+        unique_keywords_counts = [keywords[l] for l in unique_keywords]
         for index, name in enumerate(unique_keywords):
+            length = unique_keywords_lengths[index]
             for other_index in range(index+1, len(unique_keywords)):
+                if 2 * length <= 0.8 * (length + unique_keywords_lengths[other_index]):
+                    break
                 other_name = unique_keywords[other_index]
-                if osg.name_similarity(name, other_name) > 0.8:
+                if max(osg.name_similarity(name, other_name), osg.name_similarity(other_name, name)) > 0.8:
                     print(' Keywords {} ({}) - {} ({}) are similar'.format(name, unique_keywords_counts[index], other_name, unique_keywords_counts[other_index]))
 
         # get all names of frameworks and library also using osg.code_dependencies_aliases
-        valid_dependencies = list(c.general_code_dependencies_without_entry.keys())
+        valid_dependencies = set(c.general_code_dependencies_without_entry.keys())
         for entry in self.entries:
-            if any((x in ('framework', 'library', 'game engine') for x in entry['Keyword'])):
+            if any((x in ('framework', 'library', 'game engine') for x in entry['_values']['Keyword'])):
                 name = entry['Title']
                 if name in c.code_dependencies_aliases:
-                    valid_dependencies.extend(c.code_dependencies_aliases[name])
+                    valid_dependencies.update(c.code_dependencies_aliases[name])
                 else:
-                    valid_dependencies.append(name)
+                    valid_dependencies.add(name)
 
         # get all referenced code dependencies
-        referenced_dependencies = {}
+        referenced_dependencies = Counter()
         for entry in self.entries:
-            deps = entry.get('Code dependency', [])
-            for dependency in deps:
-                dependency = dependency.value
-                if dependency in referenced_dependencies:
-                    referenced_dependencies[dependency] += 1
-                else:
-                    referenced_dependencies[dependency] = 1
+            referenced_dependencies.update(entry['_values']['Code dependency'])
 
         # delete those that are valid dependencies
         referenced_dependencies = [(k, v) for k, v in referenced_dependencies.items() if k not in valid_dependencies]
@@ -181,7 +356,7 @@ class EntriesMaintainer:
             if 'Play' in entry:
                 if not 'Platform' in entry:
                     print('Entry "{}" has "Play" field but not "Platform" field, add it with "Web"'.format(name))
-                elif not 'Web' in entry['Platform']:
+                elif not 'Web' in entry['_values']['Platform']:
                     print('Entry "{}" has "Play" field but not "Web" in "Platform" field'.format(name))
 
         # javascript/typescript/php as language but not web as platform?
@@ -190,7 +365,7 @@ class EntriesMaintainer:
             name = entry['File']
             if name in ignored:
                 continue
-            if any(language in entry['Code language'] for language in ('JavaScript', 'TypeScript', 'PHP', 'CoffeeScript')) and ('Platform' not in entry or 'Web' not in entry['Platform']):
+            if any(language in entry['_values']['Code language'] for language in ('JavaScript', 'TypeScript', 'PHP', 'CoffeeScript')) and 'Web' not in entry['_values']['Platform']:
                 print('Entry "{}" has language JavaScript/PHP but not Web as platform.'.format(name))
 
         # space in name but not space as keyword
@@ -200,14 +375,14 @@ class EntriesMaintainer:
             if name in ignored:
                 continue
             title = entry['Title']
-            if 'space' in title.lower() and not 'space' in entry['Keyword']:
+            if 'space' in title.lower() and not 'space' in entry['_values']['Keyword']:
                 print('Entry "{}" has space in name but not as keyword.'.format(name))
 
         # starts with j + capital letter but not java as language
         for entry in self.entries:
             name = entry['File']
             title = entry['Title']
-            if title[0] == 'j' and title[1] == title[1].upper() and not 'Java' in entry['Code language']:
+            if title[0] == 'j' and title[1] == title[1].upper() and not 'Java' in entry['_values']['Code language']:
                 print('Entry "{}" title starts with j? but Java is not a code language.'.format(name))
 
         # search for duplicate keywords
@@ -225,7 +400,7 @@ class EntriesMaintainer:
         :return:
         """
         # sort rejected games list file
-        sort_text_file(os.path.join(c.root_path, 'code', 'rejected.txt'), 'rejected games list')
+        sort_text_file(c.rejected_file, 'rejected games list')
 
     def clean_backlog(self):
         """
@@ -236,42 +411,32 @@ class EntriesMaintainer:
             print('entries not yet loaded')
             return
         # get urls from entries
-        included_urls = osg.all_urls(self.entries)
-        included_urls = list(included_urls.keys())  # only need the URLs here
+        included_urls = set(osg.all_urls(self.entries).keys())  # only need the URLs here
 
         # get urls from rejected file
         text = utils.read_text(c.rejected_file)
-        regex = re.compile(r"\((http.*?)\)", re.MULTILINE)
-        matches = regex.findall(text)
-        rejected_urls = []
+        matches = regex_rejected_urls.findall(text)
         for match in matches:
-            urls = match.split(',')
-            urls = [x.strip() for x in urls]
-            rejected_urls.extend(urls)
-        included_urls.extend(rejected_urls)
+            included_urls.update(x.strip() for x in match.split(','))
 
         # those that only have a web archive version, also get the original version
-        more_urls = []
-        for url in included_urls:
-            if url.startswith('https://web.archive.org/web'):
-                # print(url) # sometimes the http is missing in archive links (would need proper parsing)
-                url = url[url.index('http', 5):]
-                more_urls.append(url)
-        included_urls.extend(more_urls)
+        # sometimes the http is missing in archive links (would need proper parsing)
+        # (a list, because the set cannot be updated while iterating over it)
+        included_urls.update([url[url.index('http', 5):] for url in included_urls if
+                              url.startswith('https://web.archive.org/web')])
 
         # now we strip the urls
-        stripped_urls = [utils.strip_url(x) for x in included_urls]
-        stripped_urls = set(stripped_urls)  # removes duplicates for performance
+        stripped_urls = set(map(utils.strip_url, included_urls))
 
         # read backlog and get urls from there
         text = utils.read_text(c.backlog_file)
         text = text.split('\n')
 
-        # remove those that are in stripped_game_urls
-        text = [x for x in text if utils.strip_url(x) not in stripped_urls]
+        # remove those that are in stripped_game_urls (and duplicates)
+        text = {x for x in text if utils.strip_url(x) not in stripped_urls}
 
-        # remove duplicates and sort
-        text = sorted(list(set(text)), key=str.casefold)
+        # sort
+        text = sorted(text, key=str.casefold)
         print('backlog contains {} items'.format(len(text)))
 
         # join and save again
@@ -286,37 +451,47 @@ class EntriesMaintainer:
         from time to time.
         """
 
-        # regex for finding urls (can be in <> or in ]() or after a whitespace
-        regex = re.compile(r"[\s\n]<(http.+?)>|\]\((http.+?)\)|[\s\n](http[^\s\n,]+?)[\s\n\)]")
-
         # ignore the following patterns (they give false positives here)
         ignored_urls = (
         'https://git.tukaani.org/xz.git', 'https://git.code.sf.net/', 'http://hg.hedgewars.org/hedgewars/',
         'https://git.xiph.org/vorbis.git', 'http://svn.uktrainsim.com/svn/openrails', 'https://www.srb2.org/',
         'http://wiki.srb2.org/')
 
+        # these need a "/" at the end
+        slash_appended = ('https://anongit.freedesktop.org/git', 'https://git.savannah.gnu.org/git/',
+                          'https://git.savannah.nongnu.org/git/', 'https://git.artsoft.org/')
+
+        # generally ".git" at the end is not working well, except for these
+        git_ending_okay = ('https://repo.or.cz', 'https://git.tuxfamily.org/fanwor/fanwor')
+
         # some do redirect, but we nedertheless want the original URL in the database
         redirect_okay = ('https://octaforge.org/', 'https://svn.openttd.org/', 'https://godotengine.org/download')
 
+        # some have an expired certificate but otherwise still work
+        verify_disabled = ('https://perso.b2b2c.ca/~sarrazip/dev/', 'https://dreerally.com/', 'https://henlin.net/',
+                           'https://www.megamek.org/', 'https://pixeldoctrine.com/', 'https://gitorious.org/',
+                           'https://www.opmon-game.ga/')
+
+        # even though verify is False, these SSL errors still get through
+        ssl_error_okay = ('https://gitorious.org/', 'https://www.freedroid.org/download/')
+
         # extract all links from entries
         import urllib3
         urllib3.disable_warnings()  # otherwise we cannot verify those with SSL errors without getting warnings
-        urls = {}
-        for entry, _, content in osg.entry_iterator():
+        urls = defaultdict(set)
+        for entry, _, content in osg.entry_iterator(prefetch=True):
             # apply regex
-            matches = regex.findall(content)
+            matches = regex_external_links.findall(content)
             # for each match
             for match in matches:
                 for url in match:
-                    if url and not any((url.startswith(x) for x in ignored_urls)):
+                    if url and not url.startswith(ignored_urls):
                         # ignore bzr.sourceforge, no web address found
                         if 'bzr.sourceforge.net/bzrroot/' in url:
                             continue
 
                         # add "/" at the end
-                        if any((url.startswith(x) for x in (
-                        'https://anongit.freedesktop.org/git', 'https://git.savannah.gnu.org/git/',
-                        'https://git.savannah.nongnu.org/git/', 'https://git.artsoft.org/'))):
+                        if url.startswith(slash_appended):
                             url += '/'
 
                         if url.startswith('https://bitbucket.org/') and url.endswith('.git'):
@@ -329,55 +504,54 @@ class EntriesMaintainer:
                             url = 'http://cvs.savannah.gnu.org/viewvc/' + url[37:] + '/'
 
                         # generally ".git" at the end is not working well, except sometimes
-                        if url.endswith('.git') and not any((url.startswith(x) for x in (
-                        'https://repo.or.cz', 'https://git.tuxfamily.org/fanwor/fanwor'))):
+                        if url.endswith('.git') and not url.startswith(git_ending_okay):
                             url = url[:-4]
 
-                        if url in urls:
-                            urls[url].add(entry)
-                        else:
-                            urls[url] = {entry}
+                        urls[url].add(entry)
         print('found {} unique links'.format(len(urls)))
-        print("start checking external links (can take a while)")
 
-        # now iterate over all urls
-        for url, names in urls.items():
+        # limit the number of simultaneous requests per host
+        host_limits = create_host_limits(urls)
+        print("start checking external links on {} hosts (can take a while)".format(len(host_limits)))
+
+        def check_url(url, names):
+            """
+            Checks a single url, returns the output line or None if everything is okay.
+            """
             names = list(names)  # was a set
             if len(names) == 1:
                 names = names[0]
             try:
-                verify = True
-                # some have an expired certificate but otherwise still work
-                if any((url.startswith(x) for x in (
-                'https://perso.b2b2c.ca/~sarrazip/dev/', 'https://dreerally.com/', 'https://henlin.net/',
-                'https://www.megamek.org/', 'https://pixeldoctrine.com/', 'https://gitorious.org/',
-                'https://www.opmon-game.ga/'))):
-                    verify = False
-                r = requests.head(url, headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; WOW64)'}, timeout=20,
-                                  allow_redirects=True, verify=verify)
-                if r.status_code == 405:  # head method not supported, try get
-                    r = requests.get(url, headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; WOW64)'},
-                                     timeout=20, allow_redirects=True, verify=verify)
+                r = request_url(url, host_limits, timeout=20, verify=not url.startswith(verify_disabled))
+                output = []
                 # check for bad status
                 if r.status_code != requests.codes.ok:
-                    print('{}: {} - {}'.format(names, url, r.status_code))
+                    output.append('{}: {} - {}'.format(names, url, r.status_code))
                 # check for redirect
                 if r.history and url not in redirect_okay:
                     # only / added or http->https sometimes
                     redirected_url = r.url
                     if redirected_url == url + '/':
-                        output = '{}: {} -> {} - redirect "/" at end '
+                        text = '{}: {} -> {} - redirect "/" at end '
                     elif redirected_url == 'https' + url[4:]:
-                        output = '{}: {} -> {} - redirect "https" at start'
+                        text = '{}: {} -> {} - redirect "https" at start'
                     else:
-                        output = '{}: {} -> {} - redirect '
-                    print(output.format(names, url, redirected_url))
+                        text = '{}: {} -> {} - redirect '
+                    output.append(text.format(names, url, redirected_url))
+                return '\n'.join(output) if output else None
             except Exception as e:
                 error_name = type(e).__name__
-                if error_name == 'SSLError' and any((url.startswith(x) for x in (
-                'https://gitorious.org/', 'https://www.freedroid.org/download/'))):
-                    continue  # even though verify is False, these errors still get through
-                print('{}: {} - exception {}'.format(names, url, error_name))
+                if error_name == 'SSLError' and url.startswith(ssl_error_okay):
+                    return None
+                return '{}: {} - exception {}'.format(names, url, error_name)
+
+        # check the urls in parallel and print the results as they come in
+        with concurrent.futures.ThreadPoolExecutor(max_workers=external_links_workers) as executor:
+            futures = [executor.submit(check_url, url, names) for url, names in urls.items()]
+            for future in concurrent.futures.as_completed(futures):
+                output = future.result()
+                if output:
+                    print(output)
 
     def update_readme_tocs(self):
         """
@@ -390,19 +564,11 @@ class EntriesMaintainer:
         Needs to be performed regularly.
         """
 
-        # completely delete content of toc path
-        for file in os.listdir(c.tocs_path):
-            os.remove(os.path.join(c.tocs_path, file))
-
         # read readme
-        readme_file = os.path.join(c.root_path, 'README.md')
-        readme_text = utils.read_text(readme_file)
-
-        # compile regex for identifying the building blocks in the readme
-        regex = re.compile(r"(.*?)(\[comment\]: # \(start.*?end of autogenerated content\))(.*)", re.DOTALL)
+        readme_text = utils.read_text(c.readme_file)
 
         # apply regex
-        matches = regex.findall(readme_text)
+        matches = regex_readme_autogenerated.findall(readme_text)
         if len(matches) != 1:
             raise RuntimeError('readme file has invalid structure')
         matches = matches[0]
@@ -410,62 +576,81 @@ class EntriesMaintainer:
         end = matches[2]
 
         tocs_text = ''
+        tocs = []  # title, file and entries of every toc file
+
+        # sort the entries into buckets by keyword and by platform in a single pass
+        by_keyword = defaultdict(list)
+        by_platform = defaultdict(list)
+        games = []
+        for entry in self.entries:
+            keywords = {x.value for x in entry['Keyword']}
+            for keyword in keywords:
+                by_keyword[keyword].append(entry)
+            for platform in {x.value for x in entry.get('Platform', [])}:  # (a platform could be repeated)
+                by_platform[platform].append(entry)
+            if keywords.isdisjoint(('tool', 'framework', 'library')):
+                games.append(entry)
 
         # split into games, tools, frameworks, libraries
-        games = [x for x in self.entries if not any([y in x['Keyword'] for y in ('tool', 'framework', 'library')])]
-        tools = [x for x in self.entries if 'tool' in x['Keyword']]
-        frameworks = [x for x in self.entries if 'framework' in x['Keyword']]
-        libraries = [x for x in self.entries if 'library' in x['Keyword']]
-        
+        tools = by_keyword['tool']
+        frameworks = by_keyword['framework']
+        libraries = by_keyword['library']
+
         # create games, tools, frameworks, libraries tocs
         title = 'Games'
         file = '_games.md'
         tocs_text += '**[{}](entries/tocs/{}#{})** ({}) - '.format(title, file, title, len(games))
-        create_toc(title, file, games)
+        tocs.append((title, file, games))
 
         title = 'Tools'
         file = '_tools.md'
         tocs_text += '**[{}](entries/tocs/{}#{})** ({}) - '.format(title, file, title, len(tools))
-        create_toc(title, file, tools)
+        tocs.append((title, file, tools))
 
         title = 'Frameworks'
         file = '_frameworks.md'
         tocs_text += '**[{}](entries/tocs/{}#{})** ({}) - '.format(title, file, title, len(frameworks))
-        create_toc(title, file, frameworks)
+        tocs.append((title, file, frameworks))
 
         title = 'Libraries'
         file = '_libraries.md'
         tocs_text += '**[{}](entries/tocs/{}#{})** ({})\n'.format(title, file, title, len(libraries))
-        create_toc(title, file, libraries)
+        tocs.append((title, file, libraries))
 
         # create by category
         categories_text = []
         for keyword in c.recommended_keywords:
-            filtered = [x for x in self.entries if keyword in x['Keyword']]
+            filtered = by_keyword[keyword]
             title = keyword.capitalize()
             name = keyword.replace(' ', '-')
             file = '_{}.md'.format(name)
             categories_text.append('**[{}](entries/tocs/{}#{})** ({})'.format(title, file, name, len(filtered)))
-            create_toc(title, file, filtered)
+            tocs.append((title, file, filtered))
         categories_text.sort()
         tocs_text += '\nBy category: {}\n'.format(', '.join(categories_text))
 
         # create by platform
         platforms_text = []
         for platform in c.valid_platforms:
-            filtered = [x for x in self.entries if platform in x.get('Platform', [])]
+            filtered = by_platform[platform]
             title = platform
             name = platform.lower()
             file = '_{}.md'.format(name)
             platforms_text.append('**[{}](entries/tocs/{}#{})** ({})'.format(title, file, name, len(filtered)))
-            create_toc(title, file, filtered)
+            tocs.append((title, file, filtered))
         tocs_text += '\nBy platform: {}\n'.format(', '.join(platforms_text))
 
+        # completely delete content of toc path and write all toc files (in parallel, they are independent)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=toc_workers) as executor:
+            with os.scandir(c.tocs_path) as files:
+                list(executor.map(os.unlink, [file.path for file in files]))
+            list(executor.map(lambda toc: create_toc(*toc), tocs))
+
         # insert new text in the middle (the \n before the second comment is necessary, otherwise Markdown displays it as part of the bullet list)
         text = start + "[comment]: # (start of autogenerated content, do not edit)\n" + tocs_text + "\n[comment]: # (end of autogenerated content)" + end
 
         # write to readme
-        utils.write_text(readme_file, text)
+        utils.write_text(c.readme_file, text)
 
         print('Readme and TOCs updated')
 
@@ -479,6 +664,68 @@ class EntriesMaintainer:
             print('entries not yet loaded')
             return
 
+        # code hosted not on github, gitlab, bitbucket, launchpad, sourceforge
+        popular_code_repositories = ('github.com', 'gitlab.com', 'bitbucket.org', 'code.sf.net', 'code.launchpad.net')
+
+        # collect everything in a single pass over all entries
+        number_state_beta = 0
+        number_state_mature = 0
+        entries_inactive = []
+        languages = Counter()
+        licenses = Counter()
+        keywords = Counter()
+        entries_without_download = []
+        entries_not_popular_repository = []
+        code_dependencies = Counter()
+        entries_with_code_dependency = 0
+        build_systems = Counter()
+        c_cpp_project_without_build_system = []
+        c_cpp_project_not_cmake = []
+        platforms = Counter()
+        for entry in self.entries:
+            title = entry['Title']
+            values = entry['_values']
+
+            # state
+            state = values['State']
+            if 'beta' in state:
+                number_state_beta += 1
+            if 'mature' in state:
+                number_state_mature += 1
+            if osg.is_inactive(entry):
+                entries_inactive.append((title, osg.extract_inactive_year(entry)))
+
+            # languages, licenses, keywords (reduce those starting with "multiplayer")
+            languages.update(values['Code language'])
+            licenses.update(values['Code license'])
+            keywords.update(x if not x.startswith('multiplayer') else 'multiplayer' for x in values['Keyword'])
+
+            # no download or play field
+            if 'Download' not in entry and 'Play' not in entry:
+                entries_without_download.append(title)
+
+            # if there were repositories, but none popular (or no repositories at all), add them to the list
+            if not any(popular_repo in repo for repo in values['Code repository'] for popular_repo in
+                       popular_code_repositories):
+                entries_not_popular_repository.append(title)
+
+            # code dependencies
+            if 'Code dependency' in entry:
+                code_dependencies.update(values['Code dependency'])
+                entries_with_code_dependency += 1
+
+            # build systems (and C, C++ projects without build system or with one different from CMake)
+            entry_build_systems = values['Build system']
+            build_systems.update(entry_build_systems)
+            if 'C' in values['Code language'] or 'C++' in values['Code language']:
+                if not entry_build_systems:
+                    c_cpp_project_without_build_system.append(title)
+                elif 'CMake' not in entry_build_systems:
+                    c_cpp_project_not_cmake.append(title)
+
+            # platforms
+            platforms.update(values['Platform'])
+
         # start the page
         statistics = '[comment]: # (autogenerated content, do not edit)\n# Statistics\n\n'
 
@@ -492,15 +739,12 @@ class EntriesMaintainer:
         # State (beta, mature, inactive)
         statistics += '## State\n\n'
 
-        number_state_beta = sum(1 for x in self.entries if 'beta' in x['State'])
-        number_state_mature = sum(1 for x in self.entries if 'mature' in x['State'])
-        number_inactive = sum(1 for x in self.entries if osg.is_inactive(x))
+        number_inactive = len(entries_inactive)
         statistics += '- mature: {} ({:.1f}%)\n- beta: {} ({:.1f}%)\n- inactive: {} ({:.1f}%)\n\n'.format(
             number_state_mature, rel(number_state_mature), number_state_beta, rel(number_state_beta), number_inactive,
             rel(number_inactive))
 
         if number_inactive > 0:
-            entries_inactive = [(x['Title'], osg.extract_inactive_year(x)) for x in self.entries if osg.is_inactive(x)]
             entries_inactive.sort(key=lambda x: str.casefold(x[0]))  # first sort by name
             entries_inactive.sort(key=lambda x: x[1], reverse=True)  # then sort by inactive year (more recently first)
             entries_inactive = ['{} ({})'.format(*x) for x in entries_inactive]
@@ -508,194 +752,108 @@ class EntriesMaintainer:
 
         # Language
         statistics += '## Code Languages\n\n'
-        field = 'Code language'
-
-        # get all languages together
-        languages = []
-        for entry in self.entries:
-            languages.extend(entry[field])
-        languages = [x.value for x in languages]
 
-        unique_languages = set(languages)
-        unique_languages = [(l, languages.count(l) / len(languages)) for l in unique_languages]
-        unique_languages.sort(key=lambda x: str.casefold(x[0]))  # first sort by name
+        unique_languages = relative_frequencies(languages)  # sorted by name
 
         # print languages to console
         print('\nLanguages\n')
         print('\n'.join('{} ({:.1f}%)'.format(x[0], x[1] * 100) for x in unique_languages))
 
-        unique_languages.sort(key=lambda x: x[1], reverse=True)  # then sort by occurrence (highest occurrence first)
+        unique_languages.sort(key=itemgetter(1), reverse=True)  # then sort by occurrence (highest occurrence first)
         unique_languages = ['- {} ({:.1f}%)\n'.format(x[0], x[1] * 100) for x in unique_languages]
         statistics += '##### Language frequency\n\n' + ''.join(unique_languages) + '\n'
 
         # Licenses
         statistics += '## Code licenses\n\n'
-        field = 'Code license'
 
-        # get all licenses together
-        licenses = []
-        for entry in self.entries:
-            licenses.extend(entry[field])
-        licenses = [x.value for x in licenses]
-
-        unique_licenses = set(licenses)
-        unique_licenses = [(l, licenses.count(l) / len(licenses)) for l in unique_licenses]
-        unique_licenses.sort(key=lambda x: str.casefold(x[0]))  # first sort by name
+        unique_licenses = relative_frequencies(licenses)  # sorted by name
 
         # print licenses to console
         print('\nLicenses\n')
         print('\n'.join('{} ({:.1f}%)'.format(x[0], x[1] * 100) for x in unique_licenses))
 
-        unique_licenses.sort(key=lambda x: -x[1])  # then sort by occurrence (highest occurrence first)
+        unique_licenses.sort(key=itemgetter(1), reverse=True)  # then sort by occurrence (highest occurrence first)
         unique_licenses = ['- {} ({:.1f}%)\n'.format(x[0], x[1] * 100) for x in unique_licenses]
         statistics += '##### Licenses frequency\n\n' + ''.join(unique_licenses) + '\n'
 
         # Keywords
         statistics += '## Keywords\n\n'
-        field = 'Keyword'
-
-        # get all keywords together
-        keywords = []
-        for entry in self.entries:
-            keywords.extend(entry[field])
-        keywords = [x.value for x in keywords]
 
-        # reduce those starting with "multiplayer"
-        keywords = [x if not x.startswith('multiplayer') else 'multiplayer' for x in keywords]
-
-        unique_keywords = set(keywords)
-        unique_keywords = [(l, keywords.count(l) / len(keywords)) for l in unique_keywords]
-        unique_keywords.sort(key=lambda x: str.casefold(x[0]))  # first sort by name
+        unique_keywords = relative_frequencies(keywords)  # sorted by name
 
         # print keywords to console
         print('\nKeywords\n')
         print('\n'.join('{} ({:.1f}%)'.format(x[0], x[1] * 100) for x in unique_keywords))
 
-        unique_keywords.sort(key=lambda x: -x[1])  # then sort by occurrence (highest occurrence first)
+        unique_keywords.sort(key=itemgetter(1), reverse=True)  # then sort by occurrence (highest occurrence first)
         unique_keywords = ['- {} ({:.1f}%)'.format(x[0], x[1] * 100) for x in unique_keywords]
         statistics += '##### Keywords frequency\n\n' + '\n'.join(unique_keywords) + '\n\n'
 
         # no download or play field
         statistics += '## Entries without download or play fields\n\n'
 
-        entries = []
-        for entry in self.entries:
-            if 'Download' not in entry and 'Play' not in entry:
-                entries.append(entry['Title'])
-        entries.sort(key=str.casefold)
-        statistics += '{}: '.format(len(entries)) + ', '.join(entries) + '\n\n'
+        entries_without_download.sort(key=str.casefold)
+        statistics += '{}: '.format(len(entries_without_download)) + ', '.join(entries_without_download) + '\n\n'
 
         # code hosted not on github, gitlab, bitbucket, launchpad, sourceforge
-        popular_code_repositories = ('github.com', 'gitlab.com', 'bitbucket.org', 'code.sf.net', 'code.launchpad.net')
         statistics += '## Entries with a code repository not on a popular site\n\n'
 
-        entries = []
-        field = 'Code repository'
-        for entry in self.entries:
-            popular = False
-            for repo in entry.get(field, []):
-                for popular_repo in popular_code_repositories:
-                    if popular_repo in repo.value:
-                        popular = True
-                        break
-            # if there were repositories, but none popular, add them to the list
-            if not popular:
-                entries.append(entry['Title'])
-                # print(info[field])
-        entries.sort(key=str.casefold)
-        statistics += '{}: '.format(len(entries)) + ', '.join(entries) + '\n\n'
+        entries_not_popular_repository.sort(key=str.casefold)
+        statistics += '{}: '.format(len(entries_not_popular_repository)) + ', '.join(
+            entries_not_popular_repository) + '\n\n'
 
         # Code dependencies
         statistics += '## Code dependencies\n\n'
-        field = 'Code dependency'
 
-        # get all code dependencies together
-        code_dependencies = []
-        entries_with_code_dependency = 0
-        for entry in self.entries:
-            if field in entry:
-                code_dependencies.extend(entry[field])
-                entries_with_code_dependency += 1
-        code_dependencies = [x.value for x in code_dependencies]
         statistics += 'With code dependency field {} ({:.1f}%)\n\n'.format(entries_with_code_dependency,
                                                                            rel(entries_with_code_dependency))
 
-        unique_code_dependencies = set(code_dependencies)
-        unique_code_dependencies = [(l, code_dependencies.count(l) / len(code_dependencies)) for l in
-                                    unique_code_dependencies]
-        unique_code_dependencies.sort(key=lambda x: str.casefold(x[0]))  # first sort by name
+        unique_code_dependencies = relative_frequencies(code_dependencies)  # sorted by name
 
         # print code dependencies to console
         print('\nCode dependencies\n')
         print('\n'.join('{} ({:.1f}%)'.format(x[0], x[1] * 100) for x in unique_code_dependencies))
 
-        unique_code_dependencies.sort(key=lambda x: -x[1])  # then sort by occurrence (highest occurrence first)
+        unique_code_dependencies.sort(key=itemgetter(1), reverse=True)  # then sort by occurrence (highest occurrence first)
         unique_code_dependencies = ['- {} ({:.1f}%)'.format(x[0], x[1] * 100) for x in unique_code_dependencies]
         statistics += '##### Code dependencies frequency\n\n' + '\n'.join(unique_code_dependencies) + '\n\n'
 
         # Build systems:
         statistics += '## Build systems\n\n'
-        field = 'Build system'
-
-        # get all build systems together
-        build_systems = []
-        for entry in self.entries:
-            if field in entry['Building']:
-                build_systems.extend(entry['Building'][field])
-        build_systems = [x.value for x in build_systems]
 
+        number_build_systems = sum(build_systems.values())
         statistics += 'Build systems information available for {:.1f}% of all projects.\n\n'.format(
-            rel(len(build_systems)))
+            rel(number_build_systems))
 
-        unique_build_systems = set(build_systems)
-        unique_build_systems = [(l, build_systems.count(l) / len(build_systems)) for l in unique_build_systems]
-        unique_build_systems.sort(key=lambda x: str.casefold(x[0]))  # first sort by name
+        unique_build_systems = relative_frequencies(build_systems)  # sorted by name
 
         # print build systems to console
         print('\nBuild systems\n')
         print('\n'.join('{} ({:.1f}%)'.format(x[0], x[1] * 100) for x in unique_build_systems))
 
-        unique_build_systems.sort(key=lambda x: -x[1])  # then sort by occurrence (highest occurrence first)
+        unique_build_systems.sort(key=itemgetter(1), reverse=True)  # then sort by occurrence (highest occurrence first)
         unique_build_systems = ['- {} ({:.1f}%)'.format(x[0], x[1] * 100) for x in unique_build_systems]
-        statistics += '##### Build systems frequency ({})\n\n'.format(len(build_systems)) + '\n'.join(
+        statistics += '##### Build systems frequency ({})\n\n'.format(number_build_systems) + '\n'.join(
             unique_build_systems) + '\n\n'
 
         # C, C++ projects without build system information
-        c_cpp_project_without_build_system = []
-        for entry in self.entries:
-            if field not in entry and ('C' in entry['Code language'] or 'C++' in entry['Code language']):
-                c_cpp_project_without_build_system.append(entry['Title'])
         c_cpp_project_without_build_system.sort(key=str.casefold)
         statistics += '##### C and C++ projects without build system information ({})\n\n'.format(
             len(c_cpp_project_without_build_system)) + ', '.join(c_cpp_project_without_build_system) + '\n\n'
 
         # C, C++ projects with build system information but without CMake as build system
-        c_cpp_project_not_cmake = []
-        for entry in entries:
-            if field in entry and 'CMake' in entry[field] and (
-                    'C' in entry['Code language'] or 'C++' in entry['Code language']):
-                c_cpp_project_not_cmake.append(entry['Title'])
         c_cpp_project_not_cmake.sort(key=str.casefold)
         statistics += '##### C and C++ projects with a build system different from CMake ({})\n\n'.format(
             len(c_cpp_project_not_cmake)) + ', '.join(c_cpp_project_not_cmake) + '\n\n'
 
         # Platform
         statistics += '## Platform\n\n'
-        field = 'Platform'
 
-        # get all platforms together
-        platforms = []
-        for entry in self.entries:
-            if field in entry:
-                platforms.extend(entry[field])
-        platforms = [x.value for x in platforms]
+        number_platforms = sum(platforms.values())
+        statistics += 'Platform information available for {:.1f}% of all projects.\n\n'.format(rel(number_platforms))
 
-        statistics += 'Platform information available for {:.1f}% of all projects.\n\n'.format(rel(len(platforms)))
-
-        unique_platforms = set(platforms)
-        unique_platforms = [(l, platforms.count(l) / len(platforms)) for l in unique_platforms]
-        unique_platforms.sort(key=lambda x: str.casefold(x[0]))  # first sort by name
-        unique_platforms.sort(key=lambda x: -x[1])  # then sort by occurrence (highest occurrence first)
+        unique_platforms = relative_frequencies(platforms)  # sorted by name
+        unique_platforms.sort(key=itemgetter(1), reverse=True)  # then sort by occurrence (highest occurrence first)
         unique_platforms = ['- {} ({:.1f}%)'.format(x[0], x[1] * 100) for x in unique_platforms]
         statistics += '##### Platforms frequency\n\n' + '\n'.join(unique_platforms) + '\n\n'
 
@@ -716,55 +874,17 @@ class EntriesMaintainer:
         # make database out of it
         db = {'headings': ['Game', 'Description', 'Download', 'State', 'Keyword', 'Source']}
 
-        entries = []
-        for info in self.entries:
-
-            # game & description
-            entry = ['{} (<a href="{}">home</a>, <a href="{}">entry</a>)'.format(info['Title'], info['Home'][0],
-                                                                                 r'https://github.com/Trilarion/opensourcegames/blob/master/entries/' +
-                                                                                 info['File']),
-                     textwrap.shorten(info.get('Note', ''), width=60, placeholder='..')]
-
-            # download
-            field = 'Download'
-            if field in info and info[field]:
-                entry.append('<a href="{}">Link</a>'.format(info[field][0]))
-            else:
-                entry.append('')
-
-            # state (field state is essential)
-            entry.append('{} / {}'.format(info['State'][0],
-                                          'inactive since {}'.format(osg.extract_inactive_year(info)) if osg.is_inactive(info) else 'active'))
-
-            # keywords
-            keywords = info['Keyword']
-            keywords = [x.value for x in keywords]
-            entry.append(', '.join(keywords))
-
-            # source
-            text = []
-            field = 'Code repository'
-            if field in info and info[field]:
-                text.append('<a href="{}">Source</a>'.format(info[field][0].value))
-            languages = info['Code language']
-            languages = [x.value for x in languages]
-            text.append(', '.join(languages))
-            licenses = info['Code license']
-            licenses = [x.value for x in licenses]
-            text.append(', '.join(licenses))
-            entry.append(' - '.join(text))
-
-            # append to entries
-            entries.append(entry)
-
-        # sort entries by game name
-        entries.sort(key=lambda x: str.casefold(x[0]))
+        entries = [extract_html_row(info) for info in self.entries]
+
+        # sort entries by game name (casefold every name only once)
+        entries = [(entry[0].casefold(), entry) for entry in entries]
+        entries.sort(key=itemgetter(0))
+        entries = [entry for _, entry in entries]
 
         db['data'] = entries
 
         # output
-        text = json.dumps(db, indent=1)
-        utils.write_text(c.json_db_file, text)
+        utils.write_json(c.json_db_file, db)
 
         print('HTML updated')
 
@@ -776,57 +896,43 @@ class EntriesMaintainer:
             print('entries not yet loaded')
             return
 
-        primary_repos = {'git': [], 'svn': [], 'hg': []}
+        primary_repos = {'git': set(), 'svn': set(), 'hg': set()}
         unconsumed_entries = []
 
         # for every entry filter those that are known git repositories (add additional repositories)
         for entry in self.entries:
-            repos = entry.get('Code repository', [])
-            repos = [x.value for x in repos]
             # keep the first and all others containing @add
-            if not repos:
+            repos = iter(entry['_values']['Code repository'])
+            first = next(repos, None)
+            if first is None:
                 continue
-            repos = [repos[0]] + [x for x in repos[1:] if "@add" in x]
-            for repo in repos:
-                consumed = False
-                repo = repo.split(' ')[0].strip()
-                url = osg.git_repo(repo)
-                if url:
-                    primary_repos['git'].append(url)
-                    consumed = True
-                    continue
-                url = osg.svn_repo(repo)
-                if url:
-                    primary_repos['svn'].append(url)
-                    consumed = True
-                    continue
-                url = osg.hg_repo(repo)
-                if url:
-                    primary_repos['hg'].append(url)
-                    consumed = True
-                    continue
-
-                if not consumed:
-                    unconsumed_entries.append([entry['Title'], repo])
-                    print('Entry "{}" unconsumed repo: {}'.format(entry['File'], repo))
-
-        # sort them alphabetically (and remove duplicates)
-        for k, v in primary_repos.items():
-            primary_repos[k] = sorted(set(v))
+            filtered = [first]
+            filtered.extend(x for x in repos if '@add' in x)
+            classified = classify_repos(filtered)
+            for kind, urls in primary_repos.items():
+                urls.update(classified[kind])
+            for repo in classified[None]:
+                unconsumed_entries.append([entry['Title'], repo])
+                print('Entry "{}" unconsumed repo: {}'.format(entry['File'], repo))
+
+        # sort them alphabetically (duplicates were already removed)
+        primary_repos = {k: sorted(v) for k, v in primary_repos.items()}
 
         # statistics of gits
         git_repos = primary_repos['git']
         print('{} Git repositories'.format(len(git_repos)))
-        for domain in (
-                'repo.or.cz', 'anongit.kde.org', 'bitbucket.org', 'git.code.sf.net', 'git.savannah', 'git.tuxfamily',
-                'github.com',
-                'gitlab.com', 'gitlab.com/osgames', 'gitlab.gnome.org'):
-            print('{} on {}'.format(sum(1 if domain in x else 0 for x in git_repos), domain))
+        # search every url only once for the domains, count the matches
+        matches = Counter()
+        for repo in git_repos:
+            match = regex_repo_domains.search(repo)
+            if match:
+                matches[match.group(0)] += 1
+        for domain in repo_domains:
+            count = sum(n for match, n in matches.items() if domain in match)  # gitlab.com also counts gitlab.com/osgames
+            print('{} on {}'.format(count, domain))
 
         # write them to code/git
-        json_path = os.path.join(c.root_path, 'code', 'archives.json')
-        text = json.dumps(primary_repos, indent=1)
-        utils.write_text(json_path, text)
+        utils.write_json(c.archives_file, primary_repos)
 
         print('Repositories updated')
 
@@ -836,23 +942,15 @@ class EntriesMaintainer:
         :return:
         """
 
-        git_repos = []
-        for entry in self.entries:
-            repos = entry['Code repository']
-            repos = [x.value for x in repos]
-            for repo in repos:
-                repo = repo.split(' ')[0].strip()
-                url = osg.git_repo(repo)
-                if url:
-                    git_repos.append(repo)
+        git_repos = list(chain.from_iterable(extract_git_repos(entry) for entry in self.entries))
 
-        # sort them alphabetically (and remove duplicates)
-        git_repos = sorted(list(set(git_repos)), key=str.casefold)
+        # sort them alphabetically (and remove duplicates keeping the first occurrence, casefold every repo only once)
+        git_repos = [(repo.casefold(), repo) for repo in dict.fromkeys(git_repos)]
+        git_repos.sort(key=itemgetter(0))
+        git_repos = [repo for _, repo in git_repos]
 
         # write them to code/git
-        json_path = os.path.join(c.root_path, 'code', 'git_repositories.json')
-        text = json.dumps(git_repos, indent=1)
-        utils.write_text(json_path, text)
+        utils.write_json(c.git_repositories_file, git_repos)
 
     def special_ops(self):
         """
@@ -884,13 +982,9 @@ class EntriesMaintainer:
         #     if not downloads and 'Download' in entry:
         #         del entry['Download']
 
-        # remove developers from all that have library as keyword
+        # remove developers from all that have library as keyword (add to post_load_hooks to do it while reading)
         for entry in self.entries:
-            if 'library' in entry['Keyword']:
-                devs = entry.get('Developer', [])
-                if devs:
-                    print('entry {} is library and has {} developer'.format(entry['File'], len(devs)))
-                    del entry['Developer']
+            remove_library_developers(entry)
 
         # # collect statistics on git repositories
         # stats = {}
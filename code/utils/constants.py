@@ -3,6 +3,8 @@ Paths, properties.
 """
 
 import os
+import sys
+import types
 import configparser
 
 # paths
@@ -17,17 +19,32 @@ web_css_path = os.path.join(web_path, 'css')
 private_properties_file = os.path.join(root_path, 'private.properties')
 inspirations_file = os.path.join(root_path, 'inspirations.md')
 developer_file = os.path.join(root_path, 'developers.md')
+readme_file = os.path.join(root_path, 'README.md')
+template_file = os.path.join(root_path, 'template.md')
 
 backlog_file = os.path.join(code_path, 'backlog.txt')
 rejected_file = os.path.join(code_path, 'rejected.txt')
 statistics_file = os.path.join(root_path, 'statistics.md')
 json_db_file = os.path.join(root_path, 'docs', 'data.json')
+archives_file = os.path.join(code_path, 'archives.json')
+git_repositories_file = os.path.join(code_path, 'git_repositories.json')
+grammar_entries_file = os.path.join(code_path, 'grammar_entries.lark')
+grammar_listing_file = os.path.join(code_path, 'grammar_listing.lark')
 
 # local config
 local_config_file = os.path.join(root_path, 'local-config.ini')
 
-config = configparser.ConfigParser()
-config.read(local_config_file)
+# read-only view of all of the above, computed once at import
+paths = types.MappingProxyType({
+    'root': root_path, 'entries': entries_path, 'tocs': tocs_path, 'code': code_path, 'web': web_path,
+    'web_template': web_template_path, 'web_css': web_css_path, 'private_properties': private_properties_file,
+    'inspirations': inspirations_file, 'developers': developer_file, 'readme': readme_file, 'template': template_file,
+    'backlog': backlog_file, 'rejected': rejected_file, 'statistics': statistics_file, 'json_db': json_db_file,
+    'archives': archives_file, 'git_repositories': git_repositories_file, 'grammar_entries': grammar_entries_file,
+    'grammar_listing': grammar_listing_file, 'local_config': local_config_file})
+
+# local config is only read on the first call of get_config
+config = None
 
 
 def get_config(key):
@@ -36,6 +53,10 @@ def get_config(key):
     :param key:
     :return:
     """
+    global config
+    if config is None:
+        config = configparser.ConfigParser()
+        config.read(local_config_file)
     return config['general'][key]
 
 # database entry constants
@@ -49,6 +70,7 @@ valid_properties = ('Home', 'Media', 'Inspiration', 'State', 'Play', 'Download',
     'Code license', 'Code dependency', 'Assets license', 'Developer')
 
 valid_fields = ('File', 'Title') + valid_properties + ('Note', 'Building')
+valid_fields_set = frozenset(valid_fields)
 
 url_fields = ('Home', 'Media', 'Play', 'Download', 'Code repository')
 
@@ -58,15 +80,16 @@ valid_building_properties = ('Build system', 'Build instruction')
 valid_building_fields = valid_building_properties + ('Note',)
 
 # these are the only valid platforms currently (and must be given in this order)
-valid_platforms = ('Windows', 'Linux', 'macOS', 'Android', 'iOS', 'Web')
+valid_platforms = tuple(sys.intern(x) for x in ('Windows', 'Linux', 'macOS', 'Android', 'iOS', 'Web'))
+valid_platforms_set = frozenset(valid_platforms)
 
 # these fields are not allowed to have comments
 fields_without_comments = ('Inspiration', 'Play', 'Download', 'Platform', 'Code dependency')
 
 # at least one of these must be used for every entry, this gives the principal categories and the order of the categories
-recommended_keywords = (
+recommended_keywords = tuple(sys.intern(x) for x in (
     'action', 'arcade', 'adventure', 'visual novel', 'sports', 'platform', 'puzzle', 'role playing', 'simulation',
-    'strategy', 'cards', 'board', 'music', 'educational', 'tool', 'game engine', 'framework', 'library', 'remake')
+    'strategy', 'cards', 'board', 'music', 'educational', 'tool', 'game engine', 'framework', 'library', 'remake'))
 
 framework_keywords = ('framework', 'library', 'tool')
 
@@ -128,16 +151,20 @@ language_urls = {
     'ZenScript': 'https://github.com/CraftTweaker/ZenScript'
 }
 
-known_languages = tuple(sorted(list(language_urls.keys()) + ['None', 'Script', 'Shell', '?'], key=str.casefold))
+known_languages = tuple(sys.intern(x) for x in sorted(list(language_urls.keys()) + ['None', 'Script', 'Shell', '?'],
+                                                       key=str.casefold))
+known_languages_set = frozenset(known_languages)
 
 # known licenses, anything outside of this will result in a warning during a maintenance operation
 # only these will be used when gathering statistics
-known_licenses = (
+# (the strings are interned like the values of these fields in the entries, so they share the same objects)
+known_licenses = tuple(sys.intern(x) for x in (
     '2-clause BSD', '3-clause BSD', 'AFL-3.0', 'AGPL-3.0', 'Apache-2.0', 'Artistic License-1.0', 'Artistic License-2.0',
     'Boost-1.0', 'CC-BY-NC-3.0', 'CC-BY-NC-SA-2.0', 'CC-BY-NC-SA-3.0', 'CC-BY-SA-3.0', 'CC-BY-NC-SA-4.0',
     'CC-BY-SA-4.0', 'CC0', 'Custom', 'EPL-2.0', 'GPL-2.0', 'GPL-3.0', 'IJG', 'ISC', 'Java Research License', 'LGPL-2.0',
     'LGPL-2.1', 'LGPL-3.0', 'MAME', 'MIT', 'MPL-1.1', 'MPL-2.0', 'MS-PL', 'MS-RL', 'NetHack General Public License',
-    'None', 'Proprietary', 'Public domain', 'SWIG license', 'Unlicense', 'WTFPL', 'wxWindows license', 'zlib', '?')
+    'None', 'Proprietary', 'Public domain', 'SWIG license', 'Unlicense', 'WTFPL', 'wxWindows license', 'zlib', '?'))
+known_licenses_set = frozenset(known_licenses)
 
 license_urls_repo = {
     '2-clause BSD': 'https://en.wikipedia.org/wiki/BSD_licenses#2-clause_license_(%22Simplified_BSD_License%22_or_%22FreeBSD_License%22)',
@@ -168,7 +195,7 @@ license_urls_repo = {
 
 
 def get_license_url(license):
-    if license not in known_licenses:
+    if license not in known_licenses_set:
         raise RuntimeError('Unknown license')
     for k, v in license_urls_repo.items():
         if license.startswith(k):
@@ -4,38 +4,69 @@ Specific functions working on the games.
 
 import re
 import os
+import sys
+from collections import deque
 from difflib import SequenceMatcher
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from utils import utils, osg_parse, constants as c
 
 regex_sanitize_name = re.compile(r"[^A-Za-z 0-9-+]+")
 regex_sanitize_name_space_eater = re.compile(r" +")
 
+# typical urls of git and svn services (repo urls starting with these are of this type)
+git_services = ('https://git.tuxfamily.org/', 'http://git.pond.sub.org/', 'https://gitorious.org/',
+                'https://git.code.sf.net/p/')
+svn_services = ('svn://', 'https://svn.code.sf.net/p/', 'http://svn.savannah.gnu.org/svn/', 'https://svn.icculus.org/',
+                'http://svn.icculus.org/', 'http://svn.uktrainsim.com/svn/', 'https://rpg.hamsterrepublic.com/source/wip')
+
+# fields with only a few different values (repeating in many entries)
+interned_fields = ('State', 'Platform', 'Keyword', 'Code language', 'Code license', 'Code dependency')
+
+# number of threads reading entry files in parallel when prefetching
+entry_prefetch_workers = 16
+
+# maximal number of entry files read ahead of the one currently processed when prefetching
+entry_prefetch_window = entry_prefetch_workers * 2
+
 
 def name_similarity(a, b):
     return SequenceMatcher(None, str.casefold(a), str.casefold(b)).ratio()
 
 
-def entry_iterator():
+def entry_iterator(prefetch=False):
     """
+    Iterates over all entries and yields file name, path and content of each.
 
+    With prefetch, a pool of threads reads up to entry_prefetch_window files ahead while the previous entries are
+    processed. This only pays off if the files are not in the file system cache yet (on a warm cache the sequential read
+    is faster), so it is meant for the occasional scans over the raw content of all entries.
     """
 
-    # get all entries (ignore everything starting with underscore)
-    entries = os.listdir(c.entries_path)
+    # get all entries (ignore directories ("tocs" for example))
+    entries = [entry for entry in os.listdir(c.entries_path) if not os.path.isdir(os.path.join(c.entries_path, entry))]
+    entry_paths = [os.path.join(c.entries_path, entry) for entry in entries]
 
-    # iterate over all entries
-    for entry in entries:
-        entry_path = os.path.join(c.entries_path, entry)
+    # read entries sequentially
+    if not prefetch:
+        for entry, entry_path in zip(entries, entry_paths):
+            yield entry, entry_path, utils.read_text(entry_path)
+        return
 
-        # ignore directories ("tocs" for example)
-        if os.path.isdir(entry_path):
-            continue
-
-        # read entry
-        content = utils.read_text(entry_path)
-
-        # yield
-        yield entry, entry_path, content
+    # read entries ahead in a bounded window
+    executor = ThreadPoolExecutor(max_workers=entry_prefetch_workers)
+    pending = deque()
+    try:
+        for entry, entry_path in zip(entries, entry_paths):
+            pending.append((entry, entry_path, executor.submit(utils.read_text, entry_path)))
+            if len(pending) >= entry_prefetch_window:
+                entry, entry_path, future = pending.popleft()
+                yield entry, entry_path, future.result()
+        while pending:
+            entry, entry_path, future = pending.popleft()
+            yield entry, entry_path, future.result()
+    finally:
+        executor.shutdown(cancel_futures=True)
 
 
 def canonical_name(name):
@@ -57,7 +88,7 @@ def read_developers():
 
     :return:
     """
-    grammar_file = os.path.join(c.code_path, 'grammar_listing.lark')
+    grammar_file = c.grammar_listing_file
     developers = osg_parse.read_and_parse(c.developer_file, grammar_file, osg_parse.ListingTransformer)
 
     # now developers is a list of dictionaries for every entry with some properties
@@ -83,7 +114,7 @@ def read_developers():
         for field in c.url_developer_fields:
             if field in dev:
                 content = dev[field]
-                if any(not (x.startswith('http://') or x.startswith('https://')) for x in content):
+                if any(not x.startswith(('http://', 'https://')) for x in content):
                     raise RuntimeError('Invalid URL in field "{}" in developer {}.'.format(field, dev['Name']))
 
     # convert to dictionary
@@ -143,7 +174,7 @@ def read_inspirations():
     # read inspirations
 
     # read and parse inspirations
-    grammar_file = os.path.join(c.code_path, 'grammar_listing.lark')
+    grammar_file = c.grammar_listing_file
     inspirations = osg_parse.read_and_parse(c.inspirations_file, grammar_file, osg_parse.ListingTransformer)
 
     # now inspirations is a list of dictionaries for every entry with some properties
@@ -169,7 +200,7 @@ def read_inspirations():
         for field in c.url_inspiration_fields:
             if field in inspiration:
                 content = inspiration[field]
-                if any(not (x.startswith('http://') or x.startswith('https://')) for x in content):
+                if any(not x.startswith(('http://', 'https://')) for x in content):
                     raise RuntimeError('Invalid URL in field "{}" in inspiration {}.'.format(field, inspiration['Name']))
 
     # convert to dictionary
@@ -221,13 +252,14 @@ def write_inspirations(inspirations):
     utils.write_text(c.inspirations_file, content)
 
 
-def read_entries():
+def read_entries(hooks=()):
     """
     Parses all entries and assembles interesting infos about them.
+    :param hooks: functions that are called with every entry right after it has been read (they may modify it)
     """
 
     # setup parser and transformer
-    grammar_file = os.path.join(c.code_path, 'grammar_entries.lark')
+    grammar_file = c.grammar_entries_file
     grammar = utils.read_text(grammar_file)
     parse = osg_parse.create(grammar, osg_parse.EntryTransformer)
 
@@ -251,6 +283,9 @@ def read_entries():
             exception_happened = e # just store last one
             continue
 
+        for hook in hooks:
+            hook(entry)
+
         # add to list
         entries.append(entry)
     if exception_happened:
@@ -268,7 +303,7 @@ def read_entry(file):
     """
 
     # setup parser and transformer
-    grammar_file = os.path.join(c.code_path, 'grammar_entries.lark')
+    grammar_file = c.grammar_entries_file
     grammar = utils.read_text(grammar_file)
     parse = osg_parse.create(grammar, osg_parse.EntryTransformer)
 
@@ -296,6 +331,9 @@ def check_and_process_entry(entry):
     index = 0
     for e in entry:
         field = e[0]
+        if field not in c.valid_fields_set:
+            message += 'Field "{}" either misspelled or in wrong order\n'.format(field)
+            continue
         while index < len(c.valid_fields) and field != c.valid_fields[index]:
             index += 1
         if index == len(c.valid_fields):  # must be valid fields and must be in the right order
@@ -357,12 +395,12 @@ def check_and_process_entry(entry):
         for value in values:
             if value.value.startswith('<') and value.value.endswith('>'):
                 value.value = value.value[1:-1]
-            if not any(value.startswith(x) for x in c.valid_url_prefixes):
+            if not value.startswith(c.valid_url_prefixes):
                 message += 'URL "{}" in field "{}" does not start with a valid prefix'.format(value, field)
 
     # github/gitlab repositories should end on .git and should start with https
     for repo in entry.get('Code repository', []):
-        if any(repo.startswith(x) for x in ('@', '?')):
+        if repo.startswith(('@', '?')):
             continue
         repo = repo.value.split(' ')[0].strip()
         if any((x in repo for x in ('github', 'gitlab', 'git.tuxfamily', 'git.savannah'))):
@@ -375,6 +413,9 @@ def check_and_process_entry(entry):
     if 'Platform' in entry:
         index = 0
         for platform in entry['Platform']:
+            if platform.value not in c.valid_platforms_set:
+                message += 'Platform tag "{}" either misspelled or in wrong order'.format(platform)
+                continue
             while index < len(c.valid_platforms) and platform != c.valid_platforms[index]:
                 index += 1
             if index == len(c.valid_platforms):  # must be valid platforms and must be in that order
@@ -392,18 +433,25 @@ def check_and_process_entry(entry):
     # languages should be known
     languages = entry['Code language']
     for language in languages:
-        if language not in c.known_languages:
+        if language.value not in c.known_languages_set:
             message += 'Language "{}" is not a known code language. Misspelled or new?'.format(language)
 
     # licenses should be known
     licenses = entry['Code license']
     for license in licenses:
-        if license not in c.known_licenses:
+        if license.value not in c.known_licenses_set:
             message += 'License "{}" is not a known license. Misspelled or new?'.format(license)
 
     if message:
         raise RuntimeError(message)
 
+    # the values of these fields repeat a lot between entries, interning lets them share the same string objects
+    for field in interned_fields:
+        for value in entry.get(field, []):
+            value.value = sys.intern(value.value)
+    for value in entry['Building'].get('Build system', []):
+        value.value = sys.intern(value.value)
+
     return entry
 
 
@@ -517,7 +565,7 @@ def is_url(str):
     :param str:
     :return:
     """
-    if any(str.startswith(x) for x in c.valid_url_prefixes) and not ' ' in str:
+    if str.startswith(c.valid_url_prefixes) and not ' ' in str:
         return True
     return False
 
@@ -545,6 +593,7 @@ def all_urls(entries):
     return urls
 
 
+@lru_cache(maxsize=None)
 def git_repo(repo):
     """
     Tests if a repo URL is a git repo, then returns the repo url.
@@ -555,33 +604,32 @@ def git_repo(repo):
         return repo
 
     # generic (https://*.git) or (http://*.git) ending on git
-    if (repo.startswith('https://') or repo.startswith('http://')) and repo.endswith('.git'):
+    if repo.startswith(('https://', 'http://')) and repo.endswith('.git'):
         return repo
 
     # for all others we just check if they start with the typical urls of git services
-    services = ['https://git.tuxfamily.org/', 'http://git.pond.sub.org/', 'https://gitorious.org/',
-                'https://git.code.sf.net/p/']
-    if any(repo.startswith(service) for service in services):
+    if repo.startswith(git_services):
         return repo
 
     # the rest is not recognized as a git url
     return None
 
 
+@lru_cache(maxsize=None)
 def svn_repo(repo):
     """
     Tests if a repo URL is a svn repo, then returns the repo url.
     """
 
     # we can just go for known providers of svn
-    services = ('svn://', 'https://svn.code.sf.net/p/', 'http://svn.savannah.gnu.org/svn/', 'https://svn.icculus.org/', 'http://svn.icculus.org/', 'http://svn.uktrainsim.com/svn/', 'https://rpg.hamsterrepublic.com/source/wip')
-    if any(repo.startswith(service) for service in services):
+    if repo.startswith(svn_services):
         return repo
 
     # not svn
     return None
 
 
+@lru_cache(maxsize=None)
 def hg_repo(repo):
     """
     Tests if a repo URL is a hg repo, then returns the repo url.
@@ -593,4 +641,21 @@ def hg_repo(repo):
         return repo
 
     # not hg
-    return None
\ No newline at end of file
+    return None
+
+
+@lru_cache(maxsize=None)
+def repo_type(repo):
+    """
+    Classifies a repo URL as 'git', 'svn' or 'hg' repo in a single pass. Gives the same result as trying git_repo,
+    svn_repo and hg_repo in this order. Returns None if the repo type is not recognized.
+    """
+    if repo.startswith('git://') or (repo.startswith(('https://', 'http://')) and repo.endswith('.git')):
+        return 'git'
+    if repo.startswith(git_services):
+        return 'git'
+    if repo.startswith(svn_services):
+        return 'svn'
+    if repo.startswith(('https://bitbucket.org/', 'http://hg.')):  # those ending on .git are already git
+        return 'hg'
+    return None
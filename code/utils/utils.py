@@ -38,6 +38,16 @@ def write_text(file, text):
         f.write(text)
 
 
+def write_json(file, obj):
+    """
+    Writes an object to a JSON file (UTF-8 encoded, indented). orjson serializes directly to bytes, so no intermediate
+    text needs to be encoded.
+    """
+    import orjson  # only needed here, not for the scripts that never write JSON
+    with open(file, mode='wb') as f:
+        f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+
+
 def determine_archive_version_generic(name, leading_terms, trailing_terms):
     """
     Given an archive file name, tries to get version information. Generic version that can cut off leading and trailing